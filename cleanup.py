@@ -4,7 +4,10 @@ Removes generated files (JSON, PNG, Filled PDFs) to clean up the directory.
 Keeps source code (.py), documentation (.md), and original PDFs.
 """
 
+import fnmatch
 import os
+import re
+import shutil
 from pathlib import Path
 
 def cleanup():
@@ -24,22 +27,27 @@ def cleanup():
         "__pycache__"              # Python cache
     ]
     
+    # Match each directory entry against all patterns in a single scan
+    # (normcase keeps matching case-insensitive on Windows, like glob)
+    pattern_re = re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+    
     removed_count = 0
     
-    for pattern in patterns:
-        for file_path in current_dir.glob(pattern):
+    with os.scandir(current_dir) as entries:
+        for entry in entries:
+            if not pattern_re.match(os.path.normcase(entry.name)):
+                continue
             try:
-                if file_path.is_dir():
+                if entry.is_dir(follow_symlinks=False):
                     # Handle directories like __pycache__
-                    import shutil
-                    shutil.rmtree(file_path)
-                    print(f"Removed directory: {file_path.name}")
+                    shutil.rmtree(entry.path)
+                    print(f"Removed directory: {entry.name}")
                 else:
-                    os.remove(file_path)
-                    print(f"Removed file: {file_path.name}")
+                    os.remove(entry.path)
+                    print(f"Removed file: {entry.name}")
                 removed_count += 1
             except Exception as e:
-                print(f"Error removing {file_path.name}: {e}")
+                print(f"Error removing {entry.name}: {e}")
     
     print("-" * 60)
     print(f"Cleanup complete! Removed {removed_count} items.")
@@ -7,21 +7,37 @@ from PIL import Image, ImageDraw, ImageFont
 import json
 from pathlib import Path
 
+# Shared label font; falls back to Pillow's built-in font where DejaVu Sans
+# is not installed
+try:
+    _FONT = ImageFont.truetype("DejaVuSans.ttf", 14)
+except OSError:
+    _FONT = ImageFont.load_default()
 
-def create_comprehensive_visualization(pdf_path: str, json_path: str, page_number: int = 1):
+
+def create_comprehensive_visualization(pdf_path: str, json_path: str, page_number: int = 1,
+                                       zoom: float = 1.5, compress_level: int = 1):
     """
     Create a comprehensive visualization showing the PDF page with highlighted fields
     and a detailed field information panel.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        json_path: Path to the extracted fields JSON
+        page_number: Page number to visualize (1-indexed)
+        zoom: Render scale for the PDF page; raise it for print-quality output
+        compress_level: PNG zlib level (0-9); 1 is fast, 9 gives the smallest files
     """
     # Open PDF
     doc = fitz.open(pdf_path)
     page = doc[page_number - 1]
     
     # Render page to image
-    zoom = 2.0
     mat = fitz.Matrix(zoom, zoom)
-    pix = page.get_pixmap(matrix=mat)
-    pdf_img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
+    # samples_mv is a view of the pixmap buffer, so Pillow decodes straight from
+    # it instead of from an intermediate bytes copy of the whole page
+    pdf_img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", 0, 1)
     
     # Load field data
     with open(json_path, 'r', encoding='utf-8') as f:
@@ -46,20 +62,34 @@ def create_comprehensive_visualization(pdf_path: str, json_path: str, page_numbe
     
     # Color scheme
     type_colors = {
-        1: ((255, 0, 0, 80), (255, 0, 0, 255), "Button"),
-        2: ((0, 100, 255, 80), (0, 100, 255, 255), "Text"),
-        3: ((0, 200, 0, 80), (0, 200, 0, 255), "Choice"),
-        4: ((200, 0, 200, 80), (200, 0, 200, 255), "Signature"),
+        1: ((255, 0, 0, 80), (255, 0, 0, 255)),        # Button
+        2: ((0, 100, 255, 80), (0, 100, 255, 255)),    # Text
+        3: ((0, 200, 0, 80), (0, 200, 0, 255)),        # Choice
+        4: ((200, 0, 200, 80), (200, 0, 200, 255)),    # Signature
     }
-    default_colors = ((255, 165, 0, 80), (255, 165, 0, 255), "Unknown")
+    default_colors = ((255, 165, 0, 80), (255, 165, 0, 255))
+    
+    # Field number labels are reused on the page and in the panel, so
+    # measure each one only once
+    label_sizes = {}
+    
+    def label_size(label):
+        if label not in label_sizes:
+            bbox = draw.textbbox((0, 0), label, font=_FONT)
+            label_sizes[label] = (bbox[2] - bbox[0], bbox[3] - bbox[1])
+        return label_sizes[label]
     
-    # Draw field highlights
+    # Draw field highlights, skipping widgets that would not be visible.
+    # Numbering still counts them so labels match the field list.
+    page_rect = page.rect
     for idx, widget in enumerate(widgets):
         rect = widget.rect
+        if rect.is_empty or not rect.intersects(page_rect):
+            continue
         x0, y0, x1, y1 = rect.x0 * zoom, rect.y0 * zoom, rect.x1 * zoom, rect.y1 * zoom
         
         field_type = widget.field_type
-        fill_color, outline_color, _ = type_colors.get(field_type, default_colors)
+        fill_color, outline_color = type_colors.get(field_type, default_colors)
         
         # Draw rectangle
         draw.rectangle([x0, y0, x1, y1], fill=fill_color, outline=outline_color, width=4)
@@ -81,58 +111,59 @@ def create_comprehensive_visualization(pdf_path: str, json_path: str, page_numbe
         # Draw number
         label = str(idx + 1)
         # Center the text in the circle
-        bbox = draw.textbbox((0, 0), label)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        text_width, text_height = label_size(label)
         text_x = circle_x - text_width // 2
         text_y = circle_y - text_height // 2 - 2
-        draw.text((text_x, text_y), label, fill=(0, 0, 0, 255))
+        draw.text((text_x, text_y), label, fill=(0, 0, 0, 255), font=_FONT)
     
-    # Create info panel
+    # Info panel layout
     panel_width = 800
-    panel_height = pdf_img.height
+    header_height = 100
+    legend_items = [
+        ("Text Fields", (0, 100, 255)),
+        ("Buttons/Checkboxes", (255, 0, 0)),
+        ("Dropdowns/Choice", (0, 200, 0)),
+        ("Signatures", (200, 0, 200)),
+        ("Unknown Type", (255, 165, 0))
+    ]
+    list_start_y = header_height + 35 + len(legend_items) * 20 + 20
+    line_height = 85
+    
+    # Size the panel to list every field rather than to the rendered page, so
+    # the render zoom does not change how many fields are shown
+    panel_height = max(pdf_img.height,
+                       list_start_y + 40 + len(page_data['fields']) * line_height + 10)
     info_panel = Image.new('RGB', (panel_width, panel_height), color=(250, 250, 250))
     info_draw = ImageDraw.Draw(info_panel)
     
     # Draw header
-    header_height = 100
     info_draw.rectangle([0, 0, panel_width, header_height], fill=(41, 128, 185))
     
     # Title
-    info_draw.text((20, 15), f"Form Fields - Page {page_number}", fill=(255, 255, 255))
-    info_draw.text((20, 45), f"Total Fields: {len(widgets)}", fill=(255, 255, 255))
-    info_draw.text((20, 70), f"PDF: {Path(pdf_path).name[:50]}...", fill=(255, 255, 255))
+    info_draw.text((20, 15), f"Form Fields - Page {page_number}", fill=(255, 255, 255), font=_FONT)
+    info_draw.text((20, 45), f"Total Fields: {len(widgets)}", fill=(255, 255, 255), font=_FONT)
+    info_draw.text((20, 70), f"PDF: {Path(pdf_path).name[:50]}...", fill=(255, 255, 255), font=_FONT)
     
     # Draw legend
     legend_y = header_height + 10
-    info_draw.text((20, legend_y), "Legend:", fill=(0, 0, 0))
-    
-    legend_items = [
-        ("Text Fields", (0, 100, 255)),
-        ("Buttons/Checkboxes", (255, 0, 0)),
-        ("Dropdowns/Choice", (0, 200, 0)),
-        ("Signatures", (200, 0, 200)),
-        ("Unknown Type", (255, 165, 0))
-    ]
+    info_draw.text((20, legend_y), "Legend:", fill=(0, 0, 0), font=_FONT)
     
     legend_y += 25
     for label, color in legend_items:
         info_draw.rectangle([20, legend_y, 35, legend_y + 12], fill=color, outline=(0, 0, 0))
-        info_draw.text((45, legend_y - 2), label, fill=(0, 0, 0))
+        info_draw.text((45, legend_y - 2), label, fill=(0, 0, 0), font=_FONT)
         legend_y += 20
     
     # Draw field list
-    list_start_y = legend_y + 20
     info_draw.rectangle([0, list_start_y, panel_width, list_start_y + 30], fill=(52, 73, 94))
-    info_draw.text((20, list_start_y + 5), "Field Details", fill=(255, 255, 255))
+    info_draw.text((20, list_start_y + 5), "Field Details", fill=(255, 255, 255), font=_FONT)
     
     y_pos = list_start_y + 40
-    line_height = 85
+    
+    # Map field names to widget types once instead of rescanning per field
+    widget_type_by_name = {w.field_name: w.field_type for w in widgets}
     
     for idx, field in enumerate(page_data['fields']):
-        if y_pos + line_height > panel_height - 10:
-            break  # Stop if we run out of space
-        
         # Alternating background
         if idx % 2 == 0:
             info_draw.rectangle([0, y_pos - 5, panel_width, y_pos + line_height - 5], 
@@ -143,13 +174,9 @@ def create_comprehensive_visualization(pdf_path: str, json_path: str, page_numbe
         circle_y = y_pos + 10
         circle_radius = 16
         
-        field_type_num = 0
-        for widget in widgets:
-            if widget.field_name == field['key']:
-                field_type_num = widget.field_type
-                break
+        field_type_num = widget_type_by_name.get(field['key'], 0)
         
-        _, circle_color, _ = type_colors.get(field_type_num, default_colors)
+        _, circle_color = type_colors.get(field_type_num, default_colors)
         
         info_draw.ellipse(
             [circle_x - circle_radius, circle_y - circle_radius,
@@ -160,11 +187,9 @@ def create_comprehensive_visualization(pdf_path: str, json_path: str, page_numbe
         )
         
         label = str(idx + 1)
-        bbox = info_draw.textbbox((0, 0), label)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        text_width, text_height = label_size(label)
         info_draw.text((circle_x - text_width // 2, circle_y - text_height // 2 - 2), 
-                      label, fill=(255, 255, 255))
+                      label, fill=(255, 255, 255), font=_FONT)
         
         # Field information
         x_offset = 60
@@ -173,7 +198,7 @@ def create_comprehensive_visualization(pdf_path: str, json_path: str, page_numbe
         key_text = field['key']
         if len(key_text) > 60:
             key_text = key_text[:57] + "..."
-        info_draw.text((x_offset, y_pos), f"Key: {key_text}", fill=(0, 0, 0))
+        info_draw.text((x_offset, y_pos), f"Key: {key_text}", fill=(0, 0, 0), font=_FONT)
         
         # Field type
         type_color = {
@@ -183,20 +208,21 @@ def create_comprehensive_visualization(pdf_path: str, json_path: str, page_numbe
             'Signature': (200, 0, 200)
         }.get(field['type'], (255, 140, 0))
         
-        info_draw.text((x_offset, y_pos + 20), f"Type: {field['type']}", fill=type_color)
+        info_draw.text((x_offset, y_pos + 20), f"Type: {field['type']}", fill=type_color, font=_FONT)
         
         # Coordinates
         coords = field['coordinates']
         coord_text = f"Position: ({coords['x0']:.0f}, {coords['y0']:.0f}) to ({coords['x1']:.0f}, {coords['y1']:.0f})"
-        info_draw.text((x_offset, y_pos + 40), coord_text, fill=(100, 100, 100))
+        info_draw.text((x_offset, y_pos + 40), coord_text, fill=(100, 100, 100), font=_FONT)
         
         # Parent/Child
         parent_child = f"Parent: {field['parent'][:30]}"
-        info_draw.text((x_offset, y_pos + 60), parent_child, fill=(100, 100, 100))
+        info_draw.text((x_offset, y_pos + 60), parent_child, fill=(100, 100, 100), font=_FONT)
         
         y_pos += line_height
     
-    # Combine images side by side
+    # Combine images side by side (the page sits at the top when the field
+    # list makes the panel taller than the rendered page)
     total_width = pdf_img.width + panel_width
     combined = Image.new('RGB', (total_width, panel_height), color=(255, 255, 255))
     combined.paste(pdf_img, (0, 0))
@@ -204,7 +230,7 @@ def create_comprehensive_visualization(pdf_path: str, json_path: str, page_numbe
     
     # Save
     output_path = Path(pdf_path).stem + f"_page{page_number}_comprehensive.png"
-    combined.save(output_path, "PNG")
+    combined.save(output_path, "PNG", compress_level=compress_level)
     
     print(f"\nComprehensive visualization saved to: {output_path}")
     print(f"Image dimensions: {combined.width} x {combined.height} pixels")
@@ -3,8 +3,7 @@ Example Usage of PDF Field Extractor
 Demonstrates how to use the PDFFieldExtractor class programmatically.
 """
 
-from extract_pdf_fields import PDFFieldExtractor
-import json
+from extract_pdf_fields import PDFFieldExtractor, write_json
 from pathlib import Path
 
 
@@ -14,6 +13,10 @@ def analyze_pdf_fields(pdf_path: str):
     
     Args:
         pdf_path: Path to the PDF file
+    
+    Returns:
+        Tuple of (extractor, fields_data) so callers can save the results
+        without extracting the PDF again
     """
     print(f"\n{'='*60}")
     print(f"Analyzing PDF: {pdf_path}")
@@ -57,7 +60,7 @@ def analyze_pdf_fields(pdf_path: str):
         else:
             print(f"  - {parent}: {len(info['fields'])} fields")
     
-    return fields_data
+    return extractor, fields_data
 
 
 def export_field_names_only(fields_data: dict, output_path: str):
@@ -80,8 +83,7 @@ def export_field_names_only(fields_data: dict, output_path: str):
         }
         simplified["fields_by_page"].append(page_info)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(simplified, f, indent=2, ensure_ascii=False)
+    write_json(simplified, output_path)
     
     print(f"\nSimplified field names exported to: {output_path}")
 
@@ -114,8 +116,7 @@ def export_hierarchical_structure(fields_data: dict, output_path: str):
                 "coordinates": field["coordinates"]
             })
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(hierarchical, f, indent=2, ensure_ascii=False)
+    write_json(hierarchical, output_path)
     
     print(f"Hierarchical structure exported to: {output_path}")
 
@@ -131,12 +132,10 @@ def main():
         return
     
     # Extract and analyze fields
-    fields_data = analyze_pdf_fields(pdf_file)
+    extractor, fields_data = analyze_pdf_fields(pdf_file)
     
     # Example 2: Save full extraction
     full_output = Path(pdf_file).stem + "_full_extraction.json"
-    extractor = PDFFieldExtractor(pdf_file)
-    extractor.extract_fields()
     extractor.save_to_json(full_output)
     
     # Example 3: Export simplified field names only
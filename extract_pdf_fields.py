@@ -10,25 +10,36 @@ import json
 from pathlib import Path
 from typing import Dict, List, Any
 from collections import defaultdict
+from field_types import FIELD_TYPES
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class PDFFieldExtractor:
     """Extract form fields from PDF and organize them hierarchically."""
     
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, doc: fitz.Document = None):
         """
         Initialize the PDF field extractor.
         
         Args:
             pdf_path: Path to the PDF file
+            doc: Already opened document for pdf_path (optional). It is left
+                open after extraction; closing it is up to the caller.
         """
         self.pdf_path = pdf_path
-        self.doc = None
+        self.doc = doc
+        self._owns_doc = doc is None
         self.fields_data = {
             "pdf_name": Path(pdf_path).name,
             "total_pages": 0,
             "pages": []
         }
+        # Hierarchy is filled in as fields are extracted, see _add_to_hierarchy
+        self._hierarchy = defaultdict(lambda: {"children": [], "fields": []})
+        self._seen_parents = set()
     
     def extract_fields(self) -> Dict[str, Any]:
         """
@@ -38,10 +49,12 @@ class PDFFieldExtractor:
             Dictionary containing hierarchical field information
         """
         try:
-            self.doc = fitz.open(self.pdf_path)
+            if self._owns_doc:
+                self.doc = fitz.open(self.pdf_path)
             self.fields_data["total_pages"] = len(self.doc)
             
-            # Process each page
+            # Process each page. Pages are walked serially on purpose: PyMuPDF
+            # does not support concurrent access to a document from threads.
             for page_num in range(len(self.doc)):
                 page = self.doc[page_num]
                 page_data = self._extract_page_fields(page, page_num + 1)
@@ -57,7 +70,7 @@ class PDFFieldExtractor:
             print(f"Error extracting fields: {e}")
             raise
         finally:
-            if self.doc:
+            if self._owns_doc and self.doc:
                 self.doc.close()
     
     def _extract_page_fields(self, page: fitz.Page, page_num: int) -> Dict[str, Any]:
@@ -87,6 +100,7 @@ class PDFFieldExtractor:
             field_info = self._extract_field_info(widget, page_num)
             if field_info:
                 page_data["fields"].append(field_info)
+                self._add_to_hierarchy(field_info, page_num)
         
         return page_data
     
@@ -132,7 +146,12 @@ class PDFFieldExtractor:
             
             # Add type-specific information
             if field_type == "Choice":
-                field_info["choices"] = widget.choice_values or []
+                # PyMuPDF gives (export, display) pairs as tuples; store lists so
+                # in-memory data matches what a JSON round-trip produces
+                field_info["choices"] = [
+                    list(choice) if isinstance(choice, tuple) else choice
+                    for choice in widget.choice_values or []
+                ]
             elif field_type == "Button":
                 field_info["button_caption"] = widget.button_caption or ""
             
@@ -152,13 +171,7 @@ class PDFFieldExtractor:
         Returns:
             Human-readable field type string
         """
-        field_types = {
-            1: "Button",      # Push button, checkbox, radio button
-            2: "Text",        # Text field
-            3: "Choice",      # Combo box or list box
-            4: "Signature",   # Signature field
-        }
-        return field_types.get(field_type_code, "Unknown")
+        return FIELD_TYPES.get(field_type_code, "Unknown")
     
     def _parse_field_hierarchy(self, field_name: str) -> tuple:
         """
@@ -181,32 +194,34 @@ class PDFFieldExtractor:
         
         return parent, child
     
+    def _add_to_hierarchy(self, field_info: Dict[str, Any], page_num: int):
+        """
+        Record a field under its parent in the hierarchy.
+        
+        Args:
+            field_info: Extracted field information
+            page_num: Page number (1-indexed)
+        """
+        parent = field_info["parent"]
+        
+        self._hierarchy[parent]["fields"].append({
+            "page": page_num,
+            "key": field_info["key"],
+            "type": field_info["type"]
+        })
+        
+        # Track parent-child relationships
+        if parent != "root" and parent not in self._seen_parents:
+            self._seen_parents.add(parent)
+            self._hierarchy["root"]["children"].append(parent)
+    
     def _organize_hierarchy(self):
         """
         Organize fields into a hierarchical structure based on parent-child relationships.
         This adds a 'hierarchy' section to the data.
         """
-        hierarchy = defaultdict(lambda: {"children": [], "fields": []})
-        
-        for page in self.fields_data["pages"]:
-            for field in page["fields"]:
-                parent = field["parent"]
-                child = field["child"]
-                
-                # Add to hierarchy
-                if parent not in hierarchy[parent]["fields"]:
-                    hierarchy[parent]["fields"].append({
-                        "page": page["page_number"],
-                        "key": field["key"],
-                        "type": field["type"]
-                    })
-                
-                # Track parent-child relationships
-                if parent != "root" and parent not in hierarchy["root"]["children"]:
-                    hierarchy["root"]["children"].append(parent)
-        
         # Convert defaultdict to regular dict for JSON serialization
-        self.fields_data["hierarchy"] = {k: dict(v) for k, v in hierarchy.items()}
+        self.fields_data["hierarchy"] = {k: dict(v) for k, v in self._hierarchy.items()}
     
     def save_to_json(self, output_path: str, indent: int = 2):
         """
@@ -217,8 +232,7 @@ class PDFFieldExtractor:
             indent: JSON indentation level
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(self.fields_data, f, indent=indent, ensure_ascii=False)
+            write_json(self.fields_data, output_path, indent=indent)
             print(f"SUCCESS: Fields extracted and saved to: {output_path}")
             print(f"  Total pages: {self.fields_data['total_pages']}")
             print(f"  Pages with fields: {len(self.fields_data['pages'])}")
@@ -232,6 +246,28 @@ class PDFFieldExtractor:
             raise
 
 
+def write_json(data: Any, output_path: str, indent: int = 2):
+    """
+    Write data to a UTF-8 JSON file.
+    
+    Uses orjson when it is installed and the indent is 2 (the only indentation
+    orjson supports), otherwise falls back to the standard json module. Either
+    way the document is serialized in memory and written with a single call.
+    
+    Args:
+        data: JSON-serializable data
+        output_path: Path to output JSON file
+        indent: JSON indentation level
+    """
+    if orjson is not None and indent == 2:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
+    
+    with open(output_path, 'wb') as f:
+        f.write(payload)
+
+
 def main():
     """Main execution function."""
     import sys
@@ -0,0 +1,31 @@
+"""
+Form Field Types
+Shared PyMuPDF field type names and highlight colors used by the extractor,
+the form filler and the visualization scripts.
+"""
+
+# PyMuPDF widget field_type codes and their readable names
+FIELD_TYPES = {
+    1: "Button",      # Push button, checkbox, radio button
+    2: "Text",        # Text field
+    3: "Choice",      # Combo box or list box
+    4: "Signature",   # Signature field
+}
+
+# Semi-transparent highlight fills, keyed by field_type code
+FIELD_FILL_COLORS = {
+    1: (255, 100, 100, 120),    # Button - Light Red
+    2: (100, 150, 255, 120),    # Text - Light Blue
+    3: (100, 255, 150, 120),    # Choice - Light Green
+    4: (255, 100, 255, 120),    # Signature - Light Magenta
+}
+DEFAULT_FILL_COLOR = (255, 165, 0, 120)    # Orange
+
+# Opaque highlight borders (also used for legend swatches)
+FIELD_BORDER_COLORS = {
+    1: (255, 0, 0, 255),        # Button - Red
+    2: (0, 100, 255, 255),      # Text - Blue
+    3: (0, 200, 100, 255),      # Choice - Green
+    4: (200, 0, 200, 255),      # Signature - Magenta
+}
+DEFAULT_BORDER_COLOR = (255, 140, 0, 255)
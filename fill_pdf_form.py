@@ -4,27 +4,69 @@ Fills a PDF form with realistic dummy data based on field names and types.
 """
 
 import fitz  # PyMuPDF
+import functools
 import json
 import random
 from pathlib import Path
 from datetime import datetime, timedelta
-try:
-    from faker import Faker
-    fake = Faker()
-except ImportError:
-    print("Faker not installed. Using simple dummy data.")
-    fake = None
+from field_types import FIELD_TYPES
+
+@functools.lru_cache(maxsize=None)
+def _get_faker():
+    """Import and create Faker on first use; one instance is shared per process."""
+    try:
+        from faker import Faker
+    except ImportError:
+        print("Faker not installed. Using simple dummy data.")
+        return None
+    return Faker()
+
+def _random_date_this_year() -> str:
+    """Random date between January 1st of the current year and today."""
+    today = datetime.now().date()
+    start = today.replace(month=1, day=1)
+    return (start + timedelta(days=random.randint(0, (today - start).days))).strftime("%m/%d/%Y")
+
+def _random_phone_number() -> str:
+    """Random US-style phone number."""
+    return f"({random.randint(200, 999)}) {random.randint(200, 999)}-{random.randint(0, 9999):04d}"
 
 class PDFFormFiller:
-    def __init__(self, pdf_path: str, json_data: str | dict):
+    # Dummy text generators keyed by keywords found in the lowercased field
+    # key. Rules are checked in order and the first match supplies the value.
+    # Dates, prices and phone numbers only need the random module.
+    _TEXT_GENERATORS = (
+        (('date', 'day', 'month', 'year'), lambda fake: _random_date_this_year()),
+        (('name', 'seller', 'buyer'), lambda fake: fake.name()),
+        (('zip',), lambda fake: fake.zipcode()),
+        (('city',), lambda fake: fake.city()),
+        (('state',), lambda fake: fake.state()),
+        (('address',), lambda fake: fake.address().replace('\n', ', ')),
+        (('price', 'amount', 'dollar'), lambda fake: f"{random.randint(1000, 1000000):,}"),
+        (('phone', 'number'), lambda fake: _random_phone_number()),
+        (('email',), lambda fake: fake.email()),
+        (('company', 'firm'), lambda fake: fake.company()),
+    )
+
+    def __init__(self, pdf_path: str, json_data: str | dict, doc: fitz.Document = None):
         self.pdf_path = pdf_path
-        self.doc = fitz.open(pdf_path)
+        # Reuse an already opened document for pdf_path when one is given
+        self.doc = doc if doc is not None else fitz.open(pdf_path)
+        self.fake = _get_faker()
         
         if isinstance(json_data, str):
             with open(json_data, 'r', encoding='utf-8') as f:
                 self.field_data = json.load(f)
         else:
             self.field_data = json_data
+        
+        # Index JSON fields by page number and key (first match wins, as with
+        # a linear search) so widgets can be matched without rescanning
+        self._fields_by_page = {}
+        for page_data in self.field_data['pages']:
+            fields_by_key = self._fields_by_page.setdefault(page_data['page_number'], {})
+            for field in page_data['fields']:
+                fields_by_key.setdefault(field['key'], field)
 
     def generate_value_for_field(self, field_info: dict):
         """Generate appropriate dummy data based on field metadata."""
@@ -45,26 +87,11 @@ class PDFFormFiller:
             return "Option 1"
 
         # Handle Text Fields (Type 2: Text) and others
-        if fake:
-            if 'date' in key or 'day' in key or 'month' in key or 'year' in key:
-                return fake.date_this_year().strftime("%m/%d/%Y")
-            elif 'name' in key or 'seller' in key or 'buyer' in key:
-                return fake.name()
-            elif 'address' in key or 'city' in key or 'zip' in key or 'state' in key:
-                if 'zip' in key: return fake.zipcode()
-                if 'city' in key: return fake.city()
-                if 'state' in key: return fake.state()
-                return fake.address().replace('\n', ', ')
-            elif 'price' in key or 'amount' in key or 'dollar' in key:
-                return f"{random.randint(1000, 1000000):,}"
-            elif 'phone' in key or 'number' in key:
-                return fake.phone_number()
-            elif 'email' in key:
-                return fake.email()
-            elif 'company' in key or 'firm' in key:
-                return fake.company()
-            else:
-                return fake.sentence(nb_words=3).rstrip('.')
+        if self.fake:
+            for keywords, generate in self._TEXT_GENERATORS:
+                if any(keyword in key for keyword in keywords):
+                    return generate(self.fake)
+            return self.fake.sentence(nb_words=3).rstrip('.')
         else:
             # Fallback if Faker is not available
             if 'date' in key: return "01/01/2025"
@@ -84,25 +111,33 @@ class PDFFormFiller:
         # Iterate through pages in the PDF
         for page_num, page in enumerate(self.doc):
             # Find corresponding page data in JSON
-            page_data = next((p for p in self.field_data['pages'] if p['page_number'] == page_num + 1), None)
+            fields_by_key = self._fields_by_page.get(page_num + 1)
             
-            if not page_data:
+            # Skip pages the JSON does not cover or that have no form widgets
+            if fields_by_key is None or not page.first_widget:
                 continue
 
             # Get widgets for this page
             widgets = page.widgets()
             
+            # Text drawn over pseudo-checkboxes goes into one shape that is
+            # committed once per page instead of once per insert
+            shape = page.new_shape()
+            
             for widget in widgets:
+                name = widget.field_name
+                rect = widget.rect
+                
                 # Find field info in our JSON to get context (optional, but good for consistency)
                 # We match by field name (key)
-                field_info = next((f for f in page_data['fields'] if f['key'] == widget.field_name), None)
+                field_info = fields_by_key.get(name)
                 
                 if not field_info:
                     # If not in JSON (maybe filtered out?), try to guess from widget
                     field_info = {
-                        'key': widget.field_name or "unknown",
-                        'type': self._get_field_type_str(widget.field_type),
-                        'child': widget.field_name.split('.')[-1] if widget.field_name else "unknown"
+                        'key': name or "unknown",
+                        'type': FIELD_TYPES.get(widget.field_type, 'Unknown'),
+                        'child': name.split('.')[-1] if name else "unknown"
                     }
 
                 if use_provided_values and 'field_value' in field_info:
@@ -113,30 +148,28 @@ class PDFFormFiller:
                     value = self.generate_value_for_field(field_info)
                 
                 # Check for "pseudo-checkboxes" - fields that are small but not typed as buttons
-                is_pseudo_checkbox = False
-                if widget.rect.width < 30 and widget.rect.height < 30:
-                    is_pseudo_checkbox = True
+                is_pseudo_checkbox = rect.width < 30 and rect.height < 30
+                field_type = field_info['type']
                 
                 try:
-                    if field_info['type'] == 'Button':
+                    if field_type == 'Button':
                         if value:
                             widget.field_value = True # For checkboxes/radio
                             widget.update() 
                     elif is_pseudo_checkbox:
                         # It's likely a text field acting as a checkbox
-                        print(f"DEBUG: Filling pseudo-checkbox '{widget.field_name}' with 'X'")
+                        print(f"DEBUG: Filling pseudo-checkbox '{name}' with 'X'")
                         widget.field_value = "X"
                         widget.update()
                         
                         # FORCE VISUAL FILL: Insert text directly on the page at these coordinates
                         # This ensures it looks filled even if the form widget behaves oddly
-                        rect = widget.rect
                         # Center the X
                         x = rect.x0 + (rect.width / 2) - 3
                         y = rect.y1 - 2
-                        page.insert_text((x, y), "X", fontsize=10, color=(0, 0, 0))
-                    elif field_info['type'] == 'Choice':
-                        if isinstance(value, list): value = value[0]
+                        shape.insert_text((x, y), "X", fontsize=10, color=(0, 0, 0))
+                    elif field_type == 'Choice':
+                        if isinstance(value, (list, tuple)): value = value[0]
                         widget.field_value = str(value)
                         widget.update()
                     else:
@@ -145,16 +178,14 @@ class PDFFormFiller:
                     
                     filled_count += 1
                 except Exception as e:
-                    print(f"Failed to fill field {widget.field_name}: {e}")
+                    print(f"Failed to fill field {name}: {e}")
+            
+            shape.commit()
 
         self.doc.save(output_path)
         print(f"Successfully filled {filled_count} fields.")
         print(f"Saved to: {output_path}")
 
-    def _get_field_type_str(self, type_int):
-        types = {1: 'Button', 2: 'Text', 3: 'Choice', 4: 'Signature'}
-        return types.get(type_int, 'Unknown')
-
 def main():
     pdf_file = "RF401_Updated August 17, 2024_Open Field Fill Form.pdf"
     json_file = "RF401_Updated August 17, 2024_Open Field Fill Form_fields.json"
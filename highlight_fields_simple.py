@@ -2,11 +2,47 @@
 Simple PDF Field Highlighter - Shows only the PDF page with highlighted fillable fields.
 """
 
+import functools
+
 import fitz  # PyMuPDF
 from PIL import Image, ImageDraw
 
+from field_types import (
+    DEFAULT_BORDER_COLOR, DEFAULT_FILL_COLOR, FIELD_BORDER_COLORS, FIELD_FILL_COLORS
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _legend_tile() -> Image.Image:
+    """Draw the field type legend once; it is the same for every page."""
+    tile = Image.new('RGBA', (280, 160), (255, 255, 255, 230))
+    draw = ImageDraw.Draw(tile)
+    
+    # Legend title
+    draw.text((15, 10), "Fillable Field Types:", fill=(0, 0, 0))
+    
+    # Legend items
+    legend_items = [
+        ("Text Input Fields", FIELD_BORDER_COLORS[2]),
+        ("Checkboxes/Buttons", FIELD_BORDER_COLORS[1]),
+        ("Dropdown Lists", FIELD_BORDER_COLORS[3]),
+        ("Signature Fields", FIELD_BORDER_COLORS[4]),
+    ]
+    
+    y = 35
+    for label, color in legend_items:
+        # Color box
+        draw.rectangle([15, y, 35, y + 15], fill=color, outline=(0, 0, 0))
+        # Label
+        draw.text((45, y - 2), label, fill=(0, 0, 0))
+        y += 28
+    
+    return tile
+
 
-def highlight_fields_simple(pdf_path: str, page_number: int = 1, output_path: str = None):
+def highlight_fields_simple(pdf_path: str, page_number: int = 1, output_path: str = None,
+                            zoom: float = 1.5, compress_level: int = 1,
+                            doc: fitz.Document = None):
     """
     Create a simple visualization showing only the PDF page with highlighted form fields.
     No text, no labels - just the fields highlighted with colored boxes.
@@ -15,45 +51,32 @@ def highlight_fields_simple(pdf_path: str, page_number: int = 1, output_path: st
         pdf_path: Path to PDF file
         page_number: Page number (1-indexed)
         output_path: Output image path
+        zoom: Render scale; 1.5 suits on-screen use, use 2.5 for print quality
+        compress_level: PNG zlib level (0-9); 1 is fast, 9 gives the smallest files
+        doc: Already opened document for pdf_path (optional). It is left open;
+            closing it is up to the caller.
     """
-    # Open PDF
-    doc = fitz.open(pdf_path)
+    # Open PDF unless the caller already has it open
+    owns_doc = doc is None
+    if owns_doc:
+        doc = fitz.open(pdf_path)
     page = doc[page_number - 1]
     
-    # Render at high resolution
-    zoom = 2.5
+    # Render page to image
     mat = fitz.Matrix(zoom, zoom)
-    pix = page.get_pixmap(matrix=mat)
-    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
+    # Decode from the pixmap memoryview to skip the pix.samples bytes copy
+    img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", 0, 1)
     
-    # Create overlay for highlights
-    overlay = Image.new('RGBA', img.size, (255, 255, 255, 0))
-    draw = ImageDraw.Draw(overlay)
+    # Draw highlights straight onto the page; the RGBA draw mode blends the
+    # translucent fills in place, so no separate overlay image is needed
+    draw = ImageDraw.Draw(img, 'RGBA')
     
     # Get widgets
     widgets = list(page.widgets())
     
     print(f"\nHighlighting {len(widgets)} fillable fields on page {page_number}")
     
-    # Color scheme - semi-transparent highlights
-    field_colors = {
-        1: (255, 100, 100, 120),    # Button - Light Red
-        2: (100, 150, 255, 120),    # Text - Light Blue  
-        3: (100, 255, 150, 120),    # Choice - Light Green
-        4: (255, 100, 255, 120),    # Signature - Light Magenta
-    }
-    
-    # Border colors - more opaque
-    border_colors = {
-        1: (255, 0, 0, 255),        # Button - Red
-        2: (0, 100, 255, 255),      # Text - Blue
-        3: (0, 200, 100, 255),      # Choice - Green
-        4: (200, 0, 200, 255),      # Signature - Magenta
-    }
-    
-    default_fill = (255, 165, 0, 120)    # Orange
-    default_border = (255, 140, 0, 255)
-    
     # Draw highlights for each field
     for widget in widgets:
         rect = widget.rect
@@ -63,44 +86,15 @@ def highlight_fields_simple(pdf_path: str, page_number: int = 1, output_path: st
         y1 = rect.y1 * zoom
         
         field_type = widget.field_type
-        fill = field_colors.get(field_type, default_fill)
-        border = border_colors.get(field_type, default_border)
+        fill = FIELD_FILL_COLORS.get(field_type, DEFAULT_FILL_COLOR)
+        border = FIELD_BORDER_COLORS.get(field_type, DEFAULT_BORDER_COLOR)
         
         # Draw filled rectangle with border
         draw.rectangle([x0, y0, x1, y1], fill=fill, outline=border, width=5)
     
-    # Composite the overlay onto the original image
-    img = img.convert('RGBA')
-    img = Image.alpha_composite(img, overlay)
-    img = img.convert('RGB')
-    
     # Add a subtle legend in corner
-    legend_x = 30
-    legend_y = img.height - 180
-    legend_bg = Image.new('RGBA', (280, 160), (255, 255, 255, 230))
-    img.paste(legend_bg, (legend_x, legend_y), legend_bg)
-    
-    draw_final = ImageDraw.Draw(img)
-    
-    # Legend title
-    draw_final.text((legend_x + 15, legend_y + 10), "Fillable Field Types:", fill=(0, 0, 0))
-    
-    # Legend items
-    legend_items = [
-        ("Text Input Fields", (0, 100, 255)),
-        ("Checkboxes/Buttons", (255, 0, 0)),
-        ("Dropdown Lists", (0, 200, 100)),
-        ("Signature Fields", (200, 0, 200)),
-    ]
-    
-    y = legend_y + 35
-    for label, color in legend_items:
-        # Color box
-        draw_final.rectangle([legend_x + 15, y, legend_x + 35, y + 15], 
-                           fill=color, outline=(0, 0, 0))
-        # Label
-        draw_final.text((legend_x + 45, y - 2), label, fill=(0, 0, 0))
-        y += 28
+    legend = _legend_tile()
+    img.paste(legend, (30, img.height - 180), legend)
     
     # Generate output path
     if output_path is None:
@@ -108,13 +102,14 @@ def highlight_fields_simple(pdf_path: str, page_number: int = 1, output_path: st
         output_path = Path(pdf_path).stem + f"_page{page_number}_fields_only.png"
     
     # Save
-    img.save(output_path, "PNG", quality=95)
+    img.save(output_path, "PNG", compress_level=compress_level)
     
     print(f"SUCCESS: Saved to: {output_path}")
     print(f"  Image size: {img.width} x {img.height} pixels")
     print(f"  Fields highlighted: {len(widgets)}")
     
-    doc.close()
+    if owns_doc:
+        doc.close()
     return output_path
 
 
@@ -4,13 +4,17 @@ Automatically finds all PDF files in the directory, extracts fields, fills them
 and generates visualizations.
 """
 
+import contextlib
+import io
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import sys
 
 # Import our existing tools
 # We need to make sure we can import them even if they are scripts
 try:
+    import fitz  # PyMuPDF
     from extract_pdf_fields import PDFFieldExtractor
     from fill_pdf_form import PDFFormFiller
     from highlight_fields_simple import highlight_fields_simple
@@ -24,39 +28,57 @@ def process_pdf(pdf_path: Path):
     print(f"Processing: {pdf_path.name}")
     print(f"{'='*60}")
 
-    # 1. Extract Fields
-    print("\n--- Step 1: Extracting Fields ---")
-    json_path = pdf_path.with_name(pdf_path.stem + "_fields.json")
+    # Open the PDF once and share it between all steps. Visualization runs
+    # before filling because filling modifies the open document.
     try:
-        extractor = PDFFieldExtractor(str(pdf_path))
-        extractor.extract_fields()
-        extractor.save_to_json(str(json_path))
+        doc = fitz.open(str(pdf_path))
     except Exception as e:
-        print(f"Error extracting fields: {e}")
+        print(f"Error opening PDF: {e}")
         return
 
-    # 2. Fill Form
-    print("\n--- Step 2: Filling Form ---")
-    output_pdf_path = pdf_path.with_name(pdf_path.stem + "_Filled.pdf")
     try:
-        filler = PDFFormFiller(str(pdf_path), str(json_path))
-        filler.fill_form(str(output_pdf_path))
-    except Exception as e:
-        print(f"Error filling form: {e}")
-        return
+        # 1. Extract Fields
+        print("\n--- Step 1: Extracting Fields ---")
+        json_path = pdf_path.with_name(pdf_path.stem + "_fields.json")
+        try:
+            extractor = PDFFieldExtractor(str(pdf_path), doc=doc)
+            fields_data = extractor.extract_fields()
+            extractor.save_to_json(str(json_path))
+        except Exception as e:
+            print(f"Error extracting fields: {e}")
+            return
 
-    # 3. Visualize Fields (Page 1)
-    print("\n--- Step 3: Generating Visualization ---")
-    try:
-        highlight_fields_simple(str(pdf_path), page_number=1)
-    except Exception as e:
-        print(f"Error visualizing fields: {e}")
+        # 2. Visualize Fields (Page 1)
+        print("\n--- Step 2: Generating Visualization ---")
+        try:
+            highlight_fields_simple(str(pdf_path), page_number=1, doc=doc)
+        except Exception as e:
+            print(f"Error visualizing fields: {e}")
+
+        # 3. Fill Form
+        print("\n--- Step 3: Filling Form ---")
+        output_pdf_path = pdf_path.with_name(pdf_path.stem + "_Filled.pdf")
+        try:
+            filler = PDFFormFiller(str(pdf_path), fields_data, doc=doc)
+            filler.fill_form(str(output_pdf_path))
+        except Exception as e:
+            print(f"Error filling form: {e}")
+            return
+    finally:
+        doc.close()
 
     print(f"\nSuccessfully processed {pdf_path.name}")
     print(f"Outputs:")
     print(f"  - JSON: {json_path.name}")
     print(f"  - Filled PDF: {output_pdf_path.name}")
 
+def _process_pdf_captured(pdf_path: Path) -> str:
+    """Run process_pdf in a worker process and return everything it printed."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        process_pdf(pdf_path)
+    return buffer.getvalue()
+
 def main():
     # Get current directory
     current_dir = Path(".")
@@ -78,8 +100,16 @@ def main():
 
     print(f"Found {len(pdfs_to_process)} PDF(s) to process.")
     
-    for pdf in pdfs_to_process:
-        process_pdf(pdf)
+    # PDFs are independent, so process them in parallel. Each worker's output
+    # is printed as one block when it finishes to keep the logs readable.
+    max_workers = min(len(pdfs_to_process), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_process_pdf_captured, pdf): pdf for pdf in pdfs_to_process}
+        for future in as_completed(futures):
+            try:
+                print(future.result(), end="")
+            except Exception as e:
+                print(f"Error processing {futures[future].name}: {e}")
 
     print(f"\n{'='*60}")
     print("All processing complete!")
@@ -15,16 +15,28 @@ def verify_fill(pdf_path):
         "remote controls any wired electric vehicle wall charging stations swimming pool and its equipment awnings"
     ]
     
+    targets = set(target_fields)
+    remaining = set(targets)
+    
     found_count = 0
     for page in doc:
+        # Pages without form widgets have nothing to check
+        if not page.first_widget:
+            continue
         for widget in page.widgets():
-            if widget.field_name in target_fields:
+            if widget.field_name in targets:
                 print(f"Field: {widget.field_name}")
                 print(f"  Value: '{widget.field_value}'")
                 print(f"  Rect: {widget.rect}")
                 print(f"  Status: {'[FILLED]' if widget.field_value else '[EMPTY]'}")
                 print("-" * 40)
                 found_count += 1
+                remaining.discard(widget.field_name)
+                if not remaining:
+                    break
+        # Stop once every target field has been reported
+        if not remaining:
+            break
     
     if found_count == 0:
         print("Warning: Target fields not found in the PDF.")
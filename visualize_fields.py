@@ -3,13 +3,68 @@ PDF Form Field Visualizer
 Renders a PDF page and highlights all fillable form fields with colored bounding boxes.
 """
 
+import functools
+
 import fitz  # PyMuPDF
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import json
 from pathlib import Path
 
+from field_types import (
+    DEFAULT_BORDER_COLOR, DEFAULT_FILL_COLOR, FIELD_BORDER_COLORS, FIELD_FILL_COLORS, FIELD_TYPES
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _legend_tile() -> Image.Image:
+    """
+    Draw the field type legend once as a transparent tile.
+    
+    The legend does not depend on the page, so it is cached and pasted onto
+    every visualization.
+    """
+    legend_width = 200
+    legend_height = 150
+    tile = Image.new('RGBA', (legend_width + 1, legend_height + 1), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(tile)
+    
+    # Legend background
+    draw.rectangle(
+        [0, 0, legend_width, legend_height],
+        fill=(255, 255, 255, 230),
+        outline=(0, 0, 0, 255),
+        width=2
+    )
+    
+    # Legend title
+    draw.text((10, 10), "Field Types:", fill=(0, 0, 0, 255))
+    
+    # Legend items
+    legend_items = [
+        ("Text Fields", FIELD_BORDER_COLORS[2]),
+        ("Buttons/Checkboxes", FIELD_BORDER_COLORS[1]),
+        ("Dropdowns", FIELD_BORDER_COLORS[3]),
+        ("Signatures", FIELD_BORDER_COLORS[4]),
+        ("Unknown", DEFAULT_BORDER_COLOR)
+    ]
+    
+    y_offset = 35
+    for label, color in legend_items:
+        # Color box
+        draw.rectangle(
+            [10, y_offset, 25, y_offset + 15],
+            fill=color,
+            outline=(0, 0, 0, 255)
+        )
+        # Label
+        draw.text((30, y_offset), label, fill=(0, 0, 0, 255))
+        y_offset += 22
+    
+    return tile
+
 
-def visualize_pdf_fields(pdf_path: str, page_number: int = 1, output_image: str = None):
+def visualize_pdf_fields(pdf_path: str, page_number: int = 1, output_image: str = None,
+                         zoom: float = 1.5, compress_level: int = 1):
     """
     Visualize form fields on a PDF page by highlighting them with colored boxes.
     
@@ -17,6 +72,8 @@ def visualize_pdf_fields(pdf_path: str, page_number: int = 1, output_image: str
         pdf_path: Path to the PDF file
         page_number: Page number to visualize (1-indexed)
         output_image: Path to save the output image (optional)
+        zoom: Render scale; raise it (e.g. 2.5) for print-quality output
+        compress_level: PNG zlib level (0-9); 1 is fast, 9 gives the smallest files
     
     Returns:
         Path to the saved image
@@ -25,13 +82,12 @@ def visualize_pdf_fields(pdf_path: str, page_number: int = 1, output_image: str
     doc = fitz.open(pdf_path)
     page = doc[page_number - 1]  # Convert to 0-indexed
     
-    # Render page to image at high resolution
-    zoom = 2.0  # Increase resolution
+    # Render page to image
     mat = fitz.Matrix(zoom, zoom)
-    pix = page.get_pixmap(matrix=mat)
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
     
-    # Convert to PIL Image
-    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    # Convert to PIL Image (samples_mv avoids an extra copy of the pixels)
+    img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", 0, 1)
     
     # Create drawing context
     draw = ImageDraw.Draw(img, 'RGBA')
@@ -41,24 +97,6 @@ def visualize_pdf_fields(pdf_path: str, page_number: int = 1, output_image: str
     
     print(f"\nVisualizing {len(widgets)} fields on page {page_number}")
     
-    # Color scheme for different field types
-    colors = {
-        1: (255, 0, 0, 100),      # Button - Red
-        2: (0, 0, 255, 100),      # Text - Blue
-        3: (0, 255, 0, 100),      # Choice - Green
-        4: (255, 0, 255, 100),    # Signature - Magenta
-    }
-    
-    outline_colors = {
-        1: (255, 0, 0, 255),      # Button - Red
-        2: (0, 0, 255, 255),      # Text - Blue
-        3: (0, 255, 0, 255),      # Choice - Green
-        4: (255, 0, 255, 255),    # Signature - Magenta
-    }
-    
-    default_color = (255, 165, 0, 100)  # Orange for unknown
-    default_outline = (255, 165, 0, 255)
-    
     # Draw rectangles for each field
     for idx, widget in enumerate(widgets):
         rect = widget.rect
@@ -71,8 +109,8 @@ def visualize_pdf_fields(pdf_path: str, page_number: int = 1, output_image: str
         
         # Get field type
         field_type = widget.field_type
-        fill_color = colors.get(field_type, default_color)
-        outline_color = outline_colors.get(field_type, default_outline)
+        fill_color = FIELD_FILL_COLORS.get(field_type, DEFAULT_FILL_COLOR)
+        outline_color = FIELD_BORDER_COLORS.get(field_type, DEFAULT_BORDER_COLOR)
         
         # Draw filled rectangle with transparency
         draw.rectangle([x0, y0, x1, y1], fill=fill_color, outline=outline_color, width=3)
@@ -88,49 +126,15 @@ def visualize_pdf_fields(pdf_path: str, page_number: int = 1, output_image: str
         draw.text((x0 + 5, y0 - 20), label_text, fill=(0, 0, 0, 255))
     
     # Add legend
-    legend_x = 20
-    legend_y = 20
-    legend_width = 200
-    legend_height = 150
-    
-    # Legend background
-    draw.rectangle(
-        [legend_x, legend_y, legend_x + legend_width, legend_y + legend_height],
-        fill=(255, 255, 255, 230),
-        outline=(0, 0, 0, 255),
-        width=2
-    )
-    
-    # Legend title
-    draw.text((legend_x + 10, legend_y + 10), "Field Types:", fill=(0, 0, 0, 255))
-    
-    # Legend items
-    legend_items = [
-        ("Text Fields", (0, 0, 255, 255)),
-        ("Buttons/Checkboxes", (255, 0, 0, 255)),
-        ("Dropdowns", (0, 255, 0, 255)),
-        ("Signatures", (255, 0, 255, 255)),
-        ("Unknown", (255, 165, 0, 255))
-    ]
-    
-    y_offset = 35
-    for label, color in legend_items:
-        # Color box
-        draw.rectangle(
-            [legend_x + 10, legend_y + y_offset, legend_x + 25, legend_y + y_offset + 15],
-            fill=color,
-            outline=(0, 0, 0, 255)
-        )
-        # Label
-        draw.text((legend_x + 30, legend_y + y_offset), label, fill=(0, 0, 0, 255))
-        y_offset += 22
+    legend = _legend_tile()
+    img.paste(legend, (20, 20), legend)
     
     # Generate output filename if not provided
     if output_image is None:
         output_image = Path(pdf_path).stem + f"_page{page_number}_fields_highlighted.png"
     
     # Save image
-    img.save(output_image, "PNG")
+    img.save(output_image, "PNG", compress_level=compress_level)
     print(f"\nVisualization saved to: {output_image}")
     print(f"Image size: {img.width} x {img.height} pixels")
     
@@ -140,7 +144,8 @@ def visualize_pdf_fields(pdf_path: str, page_number: int = 1, output_image: str
     return output_image
 
 
-def create_field_list_image(json_path: str, page_number: int = 1, output_image: str = None):
+def create_field_list_image(json_path: str, page_number: int = 1, output_image: str = None,
+                            compress_level: int = 1):
     """
     Create an image showing the list of fields on a page.
     
@@ -148,6 +153,7 @@ def create_field_list_image(json_path: str, page_number: int = 1, output_image:
         json_path: Path to the extracted fields JSON
         page_number: Page number to list fields for
         output_image: Path to save the output image
+        compress_level: PNG zlib level (0-9); 1 is fast, 9 gives the smallest files
     """
     # Load JSON data
     with open(json_path, 'r', encoding='utf-8') as f:
@@ -178,6 +184,9 @@ def create_field_list_image(json_path: str, page_number: int = 1, output_image:
     draw.text((20, 15), f"Form Fields - Page {page_number}", fill=(255, 255, 255))
     draw.text((20, 45), f"Total Fields: {len(page_data['fields'])}", fill=(255, 255, 255))
     
+    # Field type label colors, matching the highlight borders
+    type_colors = {name: FIELD_BORDER_COLORS[code][:3] for code, name in FIELD_TYPES.items()}
+    
     # Draw field list
     y_pos = header_height + 20
     for idx, field in enumerate(page_data['fields']):
@@ -195,12 +204,7 @@ def create_field_list_image(json_path: str, page_number: int = 1, output_image:
         draw.text((60, y_pos), field_key, fill=(0, 0, 0))
         
         # Field type
-        type_color = {
-            'Text': (0, 0, 255),
-            'Button': (255, 0, 0),
-            'Choice': (0, 128, 0),
-            'Signature': (128, 0, 128)
-        }.get(field['type'], (255, 140, 0))
+        type_color = type_colors.get(field['type'], DEFAULT_BORDER_COLOR[:3])
         
         draw.text((1000, y_pos), f"[{field['type']}]", fill=type_color)
         
@@ -211,7 +215,7 @@ def create_field_list_image(json_path: str, page_number: int = 1, output_image:
         output_image = Path(json_path).stem + f"_page{page_number}_field_list.png"
     
     # Save image
-    img.save(output_image, "PNG")
+    img.save(output_image, "PNG", compress_level=compress_level)
     print(f"Field list saved to: {output_image}")
     
     return output_image
@@ -6,16 +6,16 @@ Renders the first page of the filled PDF to verify data entry.
 import fitz  # PyMuPDF
 from PIL import Image
 
-def visualize_filled_pdf(pdf_path: str, output_image: str):
+def visualize_filled_pdf(pdf_path: str, output_image: str, zoom: float = 2.0):
     doc = fitz.open(pdf_path)
     page = doc[0]  # First page
     
-    # Render at high resolution
-    zoom = 2.0
+    # Render at high resolution; the output is a small magnified crop
     mat = fitz.Matrix(zoom, zoom)
-    pix = page.get_pixmap(matrix=mat)
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
     
-    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    # pix.samples_mv is a view of the pixmap, so no intermediate bytes copy
+    img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", 0, 1)
     
     # Crop to the area of interest (full by Seller field)
     # Rect: (91.23, 517.87, 96.91, 524.89)